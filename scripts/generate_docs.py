@@ -2,93 +2,158 @@
 
 import os
 import re
+import json
 from pathlib import Path
-from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor
+
+# Patterns are compiled once at import time and shared across every file.
+# Sources are scanned as bytes; only the captured text is decoded.
+_DOC_BLOCK_RE = re.compile(rb'/\*\*\s*\n(.*?)\*/', re.DOTALL)
+_FILE_TAG_RE = re.compile(rb'\s*\*\s*@file\s*(.*)', re.DOTALL)
+_TOKEN_RE = re.compile(rb'[a-zA-Z_][a-zA-Z0-9_]*|\S')
+_STAR_PREFIX_RE = re.compile(rb'^\s*\*\s*', re.MULTILINE)
+
+# Fewest stale files worth starting a process pool for
+_PARALLEL_MIN_FILES = 64
+
+# How far past a doc block to look for the declaration it documents
+_DECL_WINDOW = 256
+
+# Qualifiers and builtin type keywords that may precede a declared name
+_DECL_KEYWORDS = frozenset({
+    b'extern', b'static', b'const', b'unsigned', b'signed', b'long', b'short',
+    b'char', b'int', b'void', b'struct', b'enum', b'union', b'inline'
+})
+
+def _new_functions():
+    """Create the parallel lists that hold function documentation."""
+    return {'names': [], 'descs': [], 'params': [], 'returns': []}
+
+def _decode(data):
+    """Decode a captured byte string from a source file."""
+    return data.decode('utf-8', 'replace')
+
+def _parse_typedef(content, pos):
+    """Parse a `typedef struct|enum [tag] { ... } name;` declaration."""
+    open_brace = content.find(b'{', pos, pos + _DECL_WINDOW)
+    if open_brace == -1:
+        return None
+    close_brace = content.find(b'}', open_brace)
+    if close_brace == -1:
+        return None
+    
+    head = _TOKEN_RE.findall(content, pos, open_brace)
+    if len(head) not in (2, 3) or head[1] not in (b'struct', b'enum'):
+        return None
+    
+    tail = _TOKEN_RE.findall(content, close_brace + 1, close_brace + 1 + _DECL_WINDOW)
+    if len(tail) < 2 or tail[1] != b';':
+        return None
+    
+    return ('type', _decode(tail[0]), _decode(content[open_brace + 1:close_brace]))
+
+def _parse_declaration(content, pos):
+    """Classify the declaration that follows a doc block.
+    
+    Returns a (kind, name, members) tuple where kind is 'variable',
+    'function' or 'type', or None if no documentable declaration follows.
+    """
+    tokens = _TOKEN_RE.findall(content, pos, pos + _DECL_WINDOW)
+    if not tokens:
+        return None
+    if tokens[0] == b'typedef':
+        return _parse_typedef(content, pos)
+    
+    name = None
+    for token in tokens:
+        if token in _DECL_KEYWORDS or token == b'*':
+            continue
+        if token == b'(':
+            return ('function', _decode(name), None) if name else None
+        if token in (b';', b'=', b'['):
+            return ('variable', _decode(name), None) if name else None
+        if token[:1] == b'_' or token[:1].isalpha():
+            name = token
+            continue
+        return None
+    return None
+
+def _parse_function_comment(comment):
+    """Split a function comment into description, parameters and return value."""
+    desc_lines = []
+    params = []
+    returns = None
+    for line in comment.split('\n'):
+        line = line.strip()
+        if not line:
+            continue
+        if not line.startswith('@'):
+            desc_lines.append(line)
+        elif line.startswith('@param'):
+            parts = line.split(None, 2)
+            if len(parts) == 3 and parts[0] == '@param':
+                params.append((parts[1], parts[2]))
+        elif line.startswith('@return'):
+            # Covers both @return and @returns
+            parts = line.split(None, 1)
+            returns = parts[1] if len(parts) == 2 else ''
+    
+    return ' '.join(desc_lines), params, returns
+
+def _parse_members(members):
+    """Extract (member, doc) pairs from the body of a struct or enum."""
+    member_docs = []
+    for line in members.split('\n'):
+        line = line.strip()
+        if line:
+            # The member ends at any comment; only /** comments document it
+            member = line.split('/', 1)[0].strip().rstrip(',;').rstrip()
+            _, sep, after = line.partition('/**')
+            member_doc = after.rstrip().removesuffix('*/').strip() if sep else ''
+            if member:
+                member_docs.append((member, member_doc))
+    return member_docs
 
 def extract_docs_from_file(file_path):
     """Extract documentation from a C source file."""
-    with open(file_path, 'r') as f:
-        content = f.read()
+    content = Path(file_path).read_bytes()
     
     docs = {
         'file': None,
         'variables': [],
-        'functions': [],
+        'functions': _new_functions(),
         'types': []
     }
     
-    # Extract file-level documentation
-    file_doc_pattern = r'/\*\*\s*\n\s*\*\s*@file\s*(.*?)\*/\s*'
-    file_match = re.search(file_doc_pattern, content, re.DOTALL)
-    if file_match:
-        docs['file'] = file_match.group(1).strip()
-    
-    # Extract variable documentation
-    var_pattern = r'/\*\*\s*\n(.*?)\*/\s*\n\s*(?:extern\s+)?(?:static\s+)?(?:const\s+)?(?:unsigned\s+)?(?:signed\s+)?(?:long\s+)?(?:short\s+)?(?:char\s+)?(?:int\s+)?(?:void\s+)?(?:struct\s+)?(?:enum\s+)?(?:union\s+)?([a-zA-Z_][a-zA-Z0-9_]*)\s*;'
-    var_matches = re.finditer(var_pattern, content, re.DOTALL)
-    
-    for match in var_matches:
-        comment = match.group(1)
-        var_name = match.group(2)
-        
-        # Clean up the comment
-        comment = re.sub(r'^\s*\*\s*', '', comment, flags=re.MULTILINE)
-        comment = comment.strip()
-        
-        docs['variables'].append((var_name, comment))
-    
-    # Extract function documentation
-    func_pattern = r'/\*\*\s*\n(.*?)\*/\s*\n\s*(?:static\s+)?(?:inline\s+)?(?:const\s+)?(?:unsigned\s+)?(?:signed\s+)?(?:long\s+)?(?:short\s+)?(?:char\s+)?(?:int\s+)?(?:void\s+)?(?:struct\s+)?(?:enum\s+)?(?:union\s+)?([a-zA-Z_][a-zA-Z0-9_]*)\s*\([^)]*\)'
-    func_matches = re.finditer(func_pattern, content, re.DOTALL)
+    # Files without any doc comments need no further scanning
+    if b'/**' not in content:
+        return docs
     
-    for match in func_matches:
-        comment = match.group(1)
-        func_name = match.group(2)
-        
-        # Clean up the comment
-        comment = re.sub(r'^\s*\*\s*', '', comment, flags=re.MULTILINE)
-        comment = comment.strip()
-        
-        # Extract parameters and return value
-        params = []
-        returns = None
-        for line in comment.split('\n'):
-            line = line.strip()
-            if line.startswith('@param'):
-                param_match = re.match(r'@param\s+(\S+)\s+(.*)', line)
-                if param_match:
-                    params.append((param_match.group(1), param_match.group(2)))
-            elif line.startswith('@return'):
-                returns = line[8:].strip()
-        
-        docs['functions'].append((func_name, comment, params, returns))
-    
-    # Extract struct/enum documentation
-    struct_pattern = r'/\*\*\s*\n(.*?)\*/\s*\n\s*typedef\s+(?:struct|enum)\s+(?:[a-zA-Z_][a-zA-Z0-9_]*)?\s*{([^}]*)}\s*([a-zA-Z_][a-zA-Z0-9_]*)\s*;'
-    struct_matches = re.finditer(struct_pattern, content, re.DOTALL)
-    
-    for match in struct_matches:
-        comment = match.group(1)
-        members = match.group(2)
-        type_name = match.group(3)
-        
-        # Clean up the comment
-        comment = re.sub(r'^\s*\*\s*', '', comment, flags=re.MULTILINE)
-        comment = comment.strip()
+    # Walk every doc block once, dispatching on the declaration after it
+    functions = docs['functions']
+    for match in _DOC_BLOCK_RE.finditer(content):
+        # The first block tagged @file documents the file itself
+        if docs['file'] is None:
+            file_match = _FILE_TAG_RE.match(match.group(1))
+            if file_match:
+                docs['file'] = _decode(file_match.group(1).strip())
         
-        # Extract member documentation
-        member_docs = []
-        for line in members.split('\n'):
-            line = line.strip()
-            if line:
-                member_match = re.match(r'([^/]*)(?:/\*\*\s*(.*?)\s*\*/)?', line)
-                if member_match:
-                    member = member_match.group(1).strip()
-                    member_doc = member_match.group(2) if member_match.group(2) else ''
-                    if member:
-                        member_docs.append((member, member_doc))
+        decl = _parse_declaration(content, match.end())
+        if not decl:
+            continue
         
-        docs['types'].append((type_name, comment, member_docs))
+        kind, name, members = decl
+        comment = _decode(_STAR_PREFIX_RE.sub(b'', match.group(1)).strip())
+        if kind == 'variable':
+            docs['variables'].append((name, comment))
+        elif kind == 'function':
+            desc_text, params, returns = _parse_function_comment(comment)
+            functions['names'].append(name)
+            functions['descs'].append(desc_text)
+            functions['params'].append(params)
+            functions['returns'].append(returns)
+        else:
+            docs['types'].append((name, comment, _parse_members(members)))
     
     return docs
 
@@ -100,173 +165,240 @@ def generate_markdown(docs, file_path):
     # Get the relative path for the title
     rel_path = str(file_path).replace('src/', '').replace('include/', '')
     
-    markdown = f"# {rel_path}\n\n"
+    parts = [f"# {rel_path}\n\n"]
     
     # Add file documentation if present
     if docs['file']:
-        markdown += f"{docs['file']}\n\n"
+        parts.append(f"{docs['file']}\n\n")
     
     # Add variables section
     if docs['variables']:
-        markdown += "## Variables\n\n"
+        parts.append("## Variables\n\n")
         for var_name, comment in docs['variables']:
-            markdown += f"### {var_name}\n\n"
+            parts.append(f"### {var_name}\n\n")
             if comment:
-                markdown += f"{comment}\n\n"
+                parts.append(f"{comment}\n\n")
     
     # Add types section
     if docs['types']:
-        markdown += "## Types\n\n"
+        parts.append("## Types\n\n")
         for type_name, comment, members in docs['types']:
-            markdown += f"### {type_name}\n\n"
+            parts.append(f"### {type_name}\n\n")
             if comment:
-                markdown += f"{comment}\n\n"
+                parts.append(f"{comment}\n\n")
             if members:
-                markdown += "#### Members\n\n"
+                parts.append("#### Members\n\n")
                 for member, member_doc in members:
                     if member_doc:
-                        markdown += f"- `{member}` - {member_doc}\n"
+                        parts.append(f"- `{member}` - {member_doc}\n")
                     else:
-                        markdown += f"- `{member}`\n"
-                markdown += "\n"
+                        parts.append(f"- `{member}`\n")
+                parts.append("\n")
     
     # Add functions section
-    if docs['functions']:
-        markdown += "## Functions\n\n"
-        for func_name, comment, params, returns in docs['functions']:
-            markdown += f"### {func_name}\n\n"
+    functions = docs['functions']
+    if functions['names']:
+        parts.append("## Functions\n\n")
+        for i in range(len(functions['names'])):
+            parts.append(f"### {functions['names'][i]}\n\n")
+            desc_text = functions['descs'][i]
+            params = functions['params'][i]
+            returns = functions['returns'][i]
             
-            # Split into description and parameters/returns
-            desc_lines = []
-            for line in comment.split('\n'):
-                if not line.startswith('@'):
-                    desc_lines.append(line)
-            
-            desc_text = ' '.join(line.strip() for line in desc_lines if line.strip())
             if desc_text:
-                markdown += f"{desc_text}\n\n"
+                parts.append(f"{desc_text}\n\n")
             
             if params:
-                markdown += "#### Parameters\n\n"
+                parts.append("#### Parameters\n\n")
                 for param_name, param_desc in params:
-                    markdown += f"- `{param_name}`: {param_desc}\n"
-                markdown += "\n"
+                    parts.append(f"- `{param_name}`: {param_desc}\n")
+                parts.append("\n")
             
             if returns:
-                markdown += f"#### Returns\n\n{returns}\n\n"
+                parts.append(f"#### Returns\n\n{returns}\n\n")
     
-    return markdown
+    return ''.join(parts)
+
+# Module sections listed in the documentation index: (heading, subdir, description)
+_INDEX_SECTIONS = (
+    ('Core', 'core', 'Core shell functionality'),
+    ('Builtins', 'builtins', 'Built-in commands'),
+    ('Utilities', 'utils', 'Utility functions'),
+    ('Profiler', 'profiler', 'Profiling functionality'),
+)
+
+def _list_md(dir_path):
+    """Return the sorted names of markdown files in a directory."""
+    try:
+        with os.scandir(dir_path) as entries:
+            return sorted(e.name for e in entries if e.name.endswith('.md'))
+    except FileNotFoundError:
+        return []
 
 def generate_docs_index(project_root):
     """Generate index of all documentation files."""
     docs_dir = project_root / 'docs'
-    index = "# Documentation Index\n\n"
+    parts = ["# Documentation Index\n\n"]
     
     # Add main documentation files
-    index += "## Main Documentation\n\n"
-    index += "- [User Guide](../user_guide.md) - User guide for q-shell\n"
-    index += "- [Development Guidelines](../development.md) - Guidelines for developers\n"
-    index += "- [Main Documentation](main.md) - Core shell implementation details\n\n"
+    parts.append("## Main Documentation\n\n")
+    parts.append("- [User Guide](../user_guide.md) - User guide for q-shell\n")
+    parts.append("- [Development Guidelines](../development.md) - Guidelines for developers\n")
+    parts.append("- [Main Documentation](main.md) - Core shell implementation details\n\n")
     
     # Add module documentation
-    index += "## Module Documentation\n\n"
-    
-    # Core module
-    index += "### Core\n\n"
-    core_dir = docs_dir / 'core'
-    if core_dir.exists():
-        for file in sorted(core_dir.glob('*.md')):
-            rel_path = file.relative_to(docs_dir)
-            index += f"- [{file.stem}]({rel_path}) - Core shell functionality\n"
-    
-    # Builtins module
-    index += "\n### Builtins\n\n"
-    builtins_dir = docs_dir / 'builtins'
-    if builtins_dir.exists():
-        for file in sorted(builtins_dir.glob('*.md')):
-            rel_path = file.relative_to(docs_dir)
-            index += f"- [{file.stem}]({rel_path}) - Built-in commands\n"
-    
-    # Utils module
-    index += "\n### Utilities\n\n"
-    utils_dir = docs_dir / 'utils'
-    if utils_dir.exists():
-        for file in sorted(utils_dir.glob('*.md')):
-            rel_path = file.relative_to(docs_dir)
-            index += f"- [{file.stem}]({rel_path}) - Utility functions\n"
-    
-    # Profiler module
-    index += "\n### Profiler\n\n"
-    profiler_dir = docs_dir / 'profiler'
-    if profiler_dir.exists():
-        for file in sorted(profiler_dir.glob('*.md')):
-            rel_path = file.relative_to(docs_dir)
-            index += f"- [{file.stem}]({rel_path}) - Profiling functionality\n"
-    
-    return index
+    parts.append("## Module Documentation\n")
+    for heading, subdir, description in _INDEX_SECTIONS:
+        parts.append(f"\n### {heading}\n\n")
+        for name in _list_md(docs_dir / subdir):
+            stem = name[:-len('.md')]
+            parts.append(f"- [{stem}]({subdir}/{name}) - {description}\n")
+    
+    return ''.join(parts)
+
+def _extract_all(src_paths):
+    """Extract docs from each source file, in order.
+    
+    Files are independent, so large batches are spread across processes;
+    small ones run serially since starting the workers costs more than
+    the extraction itself.
+    """
+    if len(src_paths) < _PARALLEL_MIN_FILES or (os.cpu_count() or 1) == 1:
+        return [extract_docs_from_file(src_path) for src_path in src_paths]
+    with ProcessPoolExecutor() as executor:
+        return list(executor.map(extract_docs_from_file, src_paths, chunksize=16))
+
+def _generator_stamp():
+    """Identify this script so results cached by a different version are dropped."""
+    st = os.stat(__file__)
+    return [st.st_mtime_ns, st.st_size]
 
-def process_directory(src_dir, docs_dir):
-    """Process all C files in a directory and generate documentation."""
+def _load_cache(cache_path):
+    """Load cached extraction results keyed by source path."""
+    try:
+        with open(cache_path, encoding='utf-8') as f:
+            cache = json.load(f)
+    except (OSError, ValueError):
+        return {}
+    if (not isinstance(cache, dict) or cache.get('generator') != _generator_stamp()
+            or not isinstance(cache.get('files'), dict)):
+        return {}
+    return cache['files']
+
+def _save_cache(cache_path, files):
+    """Save extraction results for the next run."""
+    cache = {'generator': _generator_stamp(), 'files': files}
+    Path(cache_path).write_text(json.dumps(cache), encoding='utf-8')
+
+def process_directory(src_dir, docs_dir, cache=None):
+    """Process all C files in a directory and generate documentation.
+    
+    Sources whose mtime and size match an entry in `cache` reuse its
+    extraction results. Returns the cache entries for every file processed.
+    """
+    if cache is None:
+        cache = {}
+    
     # Track seen items to avoid duplicates
-    seen_items = defaultdict(set)
-    
-    for root, _, files in os.walk(src_dir):
-        for file in files:
-            if file.endswith(('.c', '.h')):
-                src_path = Path(root) / file
-                rel_path = src_path.relative_to(src_dir)
-                
-                # Create corresponding docs directory
-                docs_path = docs_dir / rel_path.parent
-                docs_path.mkdir(parents=True, exist_ok=True)
-                
-                # Generate documentation
-                docs = extract_docs_from_file(src_path)
-                
-                # Filter out duplicates
-                filtered_docs = {
-                    'file': docs['file'],
-                    'variables': [],
-                    'functions': [],
-                    'types': []
-                }
-                
-                # Filter variables
-                for var_name, comment in docs['variables']:
-                    if var_name not in seen_items['variables']:
-                        seen_items['variables'].add(var_name)
-                        filtered_docs['variables'].append((var_name, comment))
-                
-                # Filter functions
-                for func_name, comment, params, returns in docs['functions']:
-                    if func_name not in seen_items['functions']:
-                        seen_items['functions'].add(func_name)
-                        filtered_docs['functions'].append((func_name, comment, params, returns))
-                
-                # Filter types
-                for type_name, comment, members in docs['types']:
-                    if type_name not in seen_items['types']:
-                        seen_items['types'].add(type_name)
-                        filtered_docs['types'].append((type_name, comment, members))
-                
-                if any(filtered_docs.values()):
-                    markdown = generate_markdown(filtered_docs, rel_path)
-                    if markdown:
-                        with open(docs_path / f"{rel_path.stem}.md", 'w') as f:
-                            f.write(markdown)
+    seen_vars = set()
+    seen_funcs = set()
+    seen_types = set()
+    
+    # Docs directories already created during this run
+    created_dirs = set()
+    
+    # Paths in the walk are plain strings to avoid building Path objects per file
+    src_paths = [os.path.join(root, file)
+                 for root, _, files in os.walk(src_dir)
+                 for file in files if file.endswith(('.c', '.h'))]
+    
+    # Reuse cached results for unchanged sources
+    src_name = os.path.basename(src_dir)
+    rel_paths = []
+    keys = []
+    entries = {}
+    stale = []
+    for src_path in src_paths:
+        rel_path = os.path.relpath(src_path, src_dir)
+        key = f"{src_name}/{rel_path.replace(os.sep, '/')}"
+        rel_paths.append(rel_path)
+        keys.append(key)
+        st = os.stat(src_path)
+        entry = cache.get(key)
+        if (isinstance(entry, dict) and entry.get('mtime_ns') == st.st_mtime_ns
+                and entry.get('size') == st.st_size and isinstance(entry.get('docs'), dict)):
+            entries[key] = entry
+        else:
+            stale.append((key, src_path, st))
+    
+    # The duplicate filtering below depends on order and stays sequential
+    results = _extract_all([src_path for _, src_path, _ in stale])
+    for (key, _, st), docs in zip(stale, results):
+        entries[key] = {'mtime_ns': st.st_mtime_ns, 'size': st.st_size, 'docs': docs}
+    
+    for rel_path, key in zip(rel_paths, keys):
+        docs = entries[key]['docs']
+        
+        # Create corresponding docs directory
+        docs_path = os.path.join(docs_dir, os.path.dirname(rel_path))
+        if docs_path not in created_dirs:
+            os.makedirs(docs_path, exist_ok=True)
+            created_dirs.add(docs_path)
+        
+        # Filter out duplicates
+        filtered_docs = {
+            'file': docs['file'],
+            'variables': [],
+            'functions': _new_functions(),
+            'types': []
+        }
+        
+        # Filter variables
+        for var_name, comment in docs['variables']:
+            if var_name not in seen_vars:
+                seen_vars.add(var_name)
+                filtered_docs['variables'].append((var_name, comment))
+        
+        # Filter functions
+        functions = docs['functions']
+        filtered_functions = filtered_docs['functions']
+        for i, func_name in enumerate(functions['names']):
+            if func_name not in seen_funcs:
+                seen_funcs.add(func_name)
+                for field in ('names', 'descs', 'params', 'returns'):
+                    filtered_functions[field].append(functions[field][i])
+        
+        # Filter types
+        for type_name, comment, members in docs['types']:
+            if type_name not in seen_types:
+                seen_types.add(type_name)
+                filtered_docs['types'].append((type_name, comment, members))
+        
+        if (filtered_docs['file'] or filtered_docs['variables']
+                or filtered_functions['names'] or filtered_docs['types']):
+            markdown = generate_markdown(filtered_docs, rel_path)
+            if markdown:
+                stem = os.path.splitext(os.path.basename(rel_path))[0]
+                Path(docs_path, f"{stem}.md").write_text(markdown, encoding='utf-8')
+    
+    return entries
 
 def main():
     # Get the project root directory
     project_root = Path(__file__).parent.parent
     
+    # Extraction results from the previous run, kept outside the docs tree
+    cache_path = project_root / '.docs_cache.json'
+    cache = _load_cache(cache_path)
+    
     # Process source directories
-    process_directory(project_root / 'src', project_root / 'docs')
-    process_directory(project_root / 'include', project_root / 'docs')
+    entries = process_directory(project_root / 'src', project_root / 'docs', cache)
+    entries.update(process_directory(project_root / 'include', project_root / 'docs', cache))
+    _save_cache(cache_path, entries)
     
     # Generate documentation index
     index = generate_docs_index(project_root)
-    with open(project_root / 'docs' / 'index.md', 'w') as f:
-        f.write(index)
+    (project_root / 'docs' / 'index.md').write_text(index, encoding='utf-8')
     
     # Copy main documentation files to root
     main_docs = ['development.md', 'user_guide.md']
@@ -274,8 +406,7 @@ def main():
         src = project_root / 'docs' / doc
         dst = project_root / doc
         if src.exists():
-            with open(src, 'r') as f:
-                content = f.read()
+            content = src.read_text(encoding='utf-8')
             
             # Add documentation index link
             if doc == 'development.md':
@@ -286,8 +417,7 @@ def main():
                 content += "- [Development Guidelines](../development.md) - For developers\n"
                 content += "- [API Documentation](docs/index.md) - Detailed API reference\n"
             
-            with open(dst, 'w') as f:
-                f.write(content)
+            dst.write_text(content, encoding='utf-8')
 
 if __name__ == '__main__':
     main() 
\ No newline at end of file